@@ -0,0 +1,155 @@
+import json
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Faster parser backends are optional; without them the crawler uses BeautifulSoup
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    etree = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+
+# Every backend yields one dict per div.base-card, in page order, with these
+# fields: the stripped text of each element, the link's href and the posting
+# time's datetime attribute, or None when it is missing. The page is parsed up
+# front, but each card's fields are extracted only when the caller reaches it,
+# so the cards after an early stop are never extracted.
+CARD_FIELDS = ('url', 'title', 'company', 'location', 'date_posted', 'posted_date')
+
+# Only job-card subtrees are built into a tree; the rest of the page is skipped.
+# The class attribute is matched as a whole string while parsing, hence the split.
+CARD_STRAINER = SoupStrainer('div', class_=lambda classes: classes is not None and 'base-card' in classes.split())
+
+
+# Postings from the last day are marked with the --new variant of the date class
+DATE_CLASSES = ['job-search-card__listdate', 'job-search-card__listdate--new']
+DATE_SELECTOR = ', '.join(f'time.{date_class}' for date_class in DATE_CLASSES)
+
+
+def _text(element):
+    return element.text.strip() if element is not None else None
+
+
+def parse_cards_bs4(html):
+    """Extract job card fields with BeautifulSoup, the reference backend."""
+    for card in BeautifulSoup(html, 'html.parser', parse_only=CARD_STRAINER).find_all('div', class_='base-card'):
+        link_element = card.find('a', class_='base-card__full-link', href=True)
+        date_element = card.find('time', class_=DATE_CLASSES)
+        yield {
+            'url': link_element['href'] if link_element is not None else None,
+            'title': _text(card.find('h3', class_='base-search-card__title')),
+            'company': _text(card.find('h4', class_='base-search-card__subtitle')),
+            'location': _text(card.find('span', class_='job-search-card__location')),
+            'date_posted': _text(date_element),
+            'posted_date': date_element.get('datetime') if date_element is not None else None,
+        }
+
+
+def _has_class(tag, *class_names):
+    tests = [f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')" for class_name in class_names]
+    return f"{tag}[{' or '.join(tests)}]"
+
+
+if etree is not None:
+    LXML_CARD = etree.XPath('//' + _has_class('div', 'base-card'))
+    LXML_SELECTORS = {
+        'url': etree.XPath('(.//' + _has_class('a', 'base-card__full-link') + '[@href])[1]/@href'),
+        'title': etree.XPath('(.//' + _has_class('h3', 'base-search-card__title') + ')[1]'),
+        'company': etree.XPath('(.//' + _has_class('h4', 'base-search-card__subtitle') + ')[1]'),
+        'location': etree.XPath('(.//' + _has_class('span', 'job-search-card__location') + ')[1]'),
+        'date_posted': etree.XPath('(.//' + _has_class('time', *DATE_CLASSES) + ')[1]'),
+        'posted_date': etree.XPath('(.//' + _has_class('time', *DATE_CLASSES) + ')[1]/@datetime'),
+    }
+
+
+def parse_cards_lxml(html):
+    """Extract job card fields with lxml and precompiled XPath selectors."""
+    if not html.strip():
+        return
+
+    for card in LXML_CARD(lxml.html.document_fromstring(html)):
+        fields = {}
+        for field, selector in LXML_SELECTORS.items():
+            found = selector(card)
+            if not found:
+                fields[field] = None
+            elif isinstance(found[0], str):
+                fields[field] = str(found[0])
+            else:
+                fields[field] = found[0].text_content().strip()
+        yield fields
+
+
+# Field -> (CSS selector, attribute to read or None for the element's text)
+SELECTOLAX_SELECTORS = {
+    'url': ('a.base-card__full-link[href]', 'href'),
+    'title': ('h3.base-search-card__title', None),
+    'company': ('h4.base-search-card__subtitle', None),
+    'location': ('span.job-search-card__location', None),
+    'date_posted': (DATE_SELECTOR, None),
+    'posted_date': (DATE_SELECTOR, 'datetime'),
+}
+
+
+def parse_cards_selectolax(html):
+    """Extract job card fields with selectolax's lexbor engine and CSS selectors."""
+    for card in LexborHTMLParser(html).css('div.base-card'):
+        fields = {}
+        for field, (selector, attribute) in SELECTOLAX_SELECTORS.items():
+            element = card.css_first(selector)
+            if element is None:
+                fields[field] = None
+            elif attribute is not None:
+                fields[field] = element.attributes.get(attribute)
+            else:
+                fields[field] = element.text(deep=True).strip()
+        yield fields
+
+
+# The same extraction run inside the browser, returning the fields as one JSON array
+CARD_SCRIPT = """
+const dateSelector = %s;
+return Array.from(document.querySelectorAll('div.base-card'), card => {
+    const find = selector => card.querySelector(selector);
+    const text = element => element ? element.textContent.trim() : null;
+    const link = find('a.base-card__full-link[href]');
+    const time = find(dateSelector);
+    return {
+        url: link ? link.getAttribute('href') : null,
+        title: text(find('h3.base-search-card__title')),
+        company: text(find('h4.base-search-card__subtitle')),
+        location: text(find('span.job-search-card__location')),
+        date_posted: text(time),
+        posted_date: time ? time.getAttribute('datetime') : null,
+    };
+});
+""" % json.dumps(DATE_SELECTOR)
+
+
+# Parser backends selectable with the 'parser_backend' setting in carwler.json
+CARD_PARSERS = {
+    'bs4': parse_cards_bs4,
+    'lxml': parse_cards_lxml,
+    'selectolax': parse_cards_selectolax,
+}
+
+BACKEND_AVAILABLE = {
+    'bs4': True,
+    'lxml': etree is not None,
+    'selectolax': LexborHTMLParser is not None,
+}
+
+
+def get_card_parser(backend):
+    """Return the card parser for a backend, falling back to BeautifulSoup when its library is missing."""
+    if backend not in CARD_PARSERS:
+        raise ValueError(f"Unknown parser backend '{backend}', expected one of {', '.join(CARD_PARSERS)}")
+    if not BACKEND_AVAILABLE[backend]:
+        print(f"{backend} is not installed, parsing job cards with BeautifulSoup")
+        return parse_cards_bs4
+    return CARD_PARSERS[backend]
@@ -0,0 +1,352 @@
+import bisect
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime
+
+
+# LinkedIn job URLs end in the numeric posting id, e.g. /jobs/view/data-scientist-at-acme-4250137687
+JOB_ID_PATTERN = re.compile(r'/jobs/view/(?:[^/?#]*-)?(\d+)')
+
+
+def extract_job_id(url):
+    """Return the numeric LinkedIn job id from a job URL, or None."""
+    match = JOB_ID_PATTERN.search(url)
+    return int(match.group(1)) if match else None
+
+
+def job_identity(job):
+    """Return a hashable identity for a job: its LinkedIn job id, else title/company/location."""
+    job_id = job.get('job_id')
+    if job_id is None:
+        job_id = extract_job_id(job.get('url', ''))
+    if job_id is not None:
+        return job_id
+    return (job['title'].strip().casefold(), job['company'].strip().casefold(), job['location'].strip().casefold())
+
+
+def scraped_timestamp(job):
+    """Return a job's scrape time in epoch seconds, deriving it from scraped_date for older records."""
+    if 'scraped_at' not in job:
+        job['scraped_at'] = int(datetime.strptime(job['scraped_date'], '%Y-%m-%d %H:%M:%S').timestamp())
+    return job['scraped_at']
+
+
+def add_in_scrape_order(jobs_by_key, jobs):
+    """Insert jobs into an identity -> job dict kept sorted by scraped_at, returning the dict."""
+    in_order = True
+    for job in jobs:
+        key = job_identity(job)
+        scraped_at = scraped_timestamp(job)
+        jobs_by_key.pop(key, None)
+        if jobs_by_key and scraped_at < next(reversed(jobs_by_key.values()))['scraped_at']:
+            in_order = False
+        jobs_by_key[key] = job
+    if in_order:
+        return jobs_by_key
+    return dict(sorted(jobs_by_key.items(), key=lambda item: item[1]['scraped_at']))
+
+
+def drop_older_than(jobs_by_key, timestamp):
+    """Bisect an identity -> job dict sorted by scraped_at and keep the jobs from timestamp on."""
+    items = list(jobs_by_key.items())
+    start = bisect.bisect_left(items, timestamp, key=lambda item: item[1]['scraped_at'])
+    return dict(items[start:]) if start else jobs_by_key
+
+
+class JobStore:
+    """Storage interface shared by the crawler and the matcher.
+
+    Jobs are kept in scrape order, and timestamps are epoch seconds matching
+    each job's scraped_at field.
+    """
+
+    def load_jobs(self):
+        """Return all stored jobs in the order they were scraped."""
+        raise NotImplementedError
+
+    def load_jobs_since(self, timestamp):
+        """Return the stored jobs scraped at or after the given timestamp, in scrape order."""
+        jobs = self.load_jobs()
+        return jobs[bisect.bisect_left(jobs, timestamp, key=lambda job: job['scraped_at']):]
+
+    def load_unsent_jobs(self):
+        """Return the stored jobs whose email has not been sent."""
+        return [job for job in self.load_jobs() if not job.get('email_sent')]
+
+    def upsert_jobs(self, jobs):
+        """Add jobs, replacing stored jobs with the same identity."""
+        raise NotImplementedError
+
+    def mark_notified(self, jobs):
+        """Flag jobs as emailed."""
+        raise NotImplementedError
+
+    def prune_older_than(self, timestamp):
+        """Delete jobs scraped before the given timestamp."""
+        raise NotImplementedError
+
+    def close(self):
+        """Release any resources held by the store."""
+
+
+class JsonJobStore(JobStore):
+    """Job store kept as a single JSON list, rewritten in full on every change."""
+
+    def __init__(self, path):
+        self.path = path
+        self.jobs = None  # identity -> job, loaded on first use
+
+    def load_jobs(self):
+        if not os.path.exists(self.path):
+            jobs = []
+        else:
+            with open(self.path, 'r') as f:
+                jobs = json.load(f)
+            if not isinstance(jobs, list):
+                jobs = [jobs]
+        self.jobs = add_in_scrape_order({}, jobs)
+        return [dict(job) for job in self.jobs.values()]
+
+    def _write(self):
+        with open(self.path, 'w') as f:
+            json.dump(list(self.jobs.values()), f, indent=4)
+
+    def upsert_jobs(self, jobs):
+        if self.jobs is None:
+            self.load_jobs()
+        self.jobs = add_in_scrape_order(self.jobs, [dict(job) for job in jobs])
+        self._write()
+
+    def mark_notified(self, jobs):
+        if self.jobs is None:
+            self.load_jobs()
+        for job in jobs:
+            self.jobs.setdefault(job_identity(job), dict(job))['email_sent'] = True
+        self._write()
+
+    def prune_older_than(self, timestamp):
+        if self.jobs is None:
+            self.load_jobs()
+        jobs = drop_older_than(self.jobs, timestamp)
+        if len(jobs) < len(self.jobs):
+            self.jobs = jobs
+            self._write()
+
+
+class JsonlJobStore(JobStore):
+    """Append-only JSON-lines job store.
+
+    Each line is an event: jobs being added, jobs being flagged as emailed or
+    a retention cutoff. Changes append only their own events, and the log is
+    rewritten from the live jobs once it grows well past their number.
+    """
+
+    def __init__(self, path, compact_ratio=2, min_compact_lines=500):
+        self.path = path
+        self.compact_ratio = compact_ratio
+        self.min_compact_lines = min_compact_lines
+        self.jobs = None  # identity -> job, replayed from the log on first use
+        self.line_count = 0
+        self.needs_newline = False
+
+    @staticmethod
+    def _encode_key(key):
+        return list(key) if isinstance(key, tuple) else key
+
+    @staticmethod
+    def _decode_key(key):
+        return tuple(key) if isinstance(key, list) else key
+
+    def _apply(self, event):
+        if event['op'] == 'add':
+            self.jobs = add_in_scrape_order(self.jobs, [event['job']])
+        elif event['op'] == 'notified':
+            for key in map(self._decode_key, event['keys']):
+                if key in self.jobs:
+                    self.jobs[key]['email_sent'] = True
+        elif event['op'] == 'prune':
+            self.jobs = drop_older_than(self.jobs, event['before'])
+
+    def load_jobs(self):
+        self.jobs = {}
+        self.line_count = 0
+        self.needs_newline = False
+
+        if not os.path.exists(self.path):
+            # Carry over the history of a whole-file JSON database next to the log
+            legacy_path = os.path.splitext(self.path)[0] + '.json'
+            if os.path.exists(legacy_path):
+                print(f"Importing jobs from {legacy_path}")
+                self.jobs = add_in_scrape_order({}, JsonJobStore(legacy_path).load_jobs())
+                self.compact()
+            return [dict(job) for job in self.jobs.values()]
+
+        with open(self.path, 'r') as f:
+            for line in f:
+                self.line_count += 1
+                self.needs_newline = not line.endswith('\n')
+                try:
+                    self._apply(json.loads(line))
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    # A torn write only loses its own event, never the rest of the log
+                    print(f"Skipping unreadable line {self.line_count} in {self.path}")
+
+        return [dict(job) for job in self.jobs.values()]
+
+    def _append(self, events):
+        """Apply events and append them to the log, compacting it when it has grown too long."""
+        if self.jobs is None:
+            self.load_jobs()
+        for event in events:
+            self._apply(event)
+
+        if self.line_count + len(events) > max(self.min_compact_lines, self.compact_ratio * len(self.jobs)):
+            self.compact()
+            return
+
+        with open(self.path, 'a') as f:
+            if self.needs_newline:
+                f.write('\n')
+            f.writelines(json.dumps(event) + '\n' for event in events)
+            f.flush()
+            os.fsync(f.fileno())
+        self.line_count += len(events)
+        self.needs_newline = False
+
+    def upsert_jobs(self, jobs):
+        if jobs:
+            self._append([{'op': 'add', 'job': dict(job)} for job in jobs])
+
+    def mark_notified(self, jobs):
+        if jobs:
+            self._append([{'op': 'notified', 'keys': [self._encode_key(job_identity(job)) for job in jobs]}])
+
+    def prune_older_than(self, timestamp):
+        if self.jobs is None:
+            self.load_jobs()
+        if self.jobs and next(iter(self.jobs.values()))['scraped_at'] < timestamp:
+            self._append([{'op': 'prune', 'before': timestamp}])
+
+    def compact(self):
+        """Rewrite the log as one add event per live job, atomically replacing the old file."""
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as f:
+            f.writelines(json.dumps({'op': 'add', 'job': job}) + '\n' for job in self.jobs.values())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self.line_count = len(self.jobs)
+        self.needs_newline = False
+
+
+class SqliteJobStore(JobStore):
+    """SQLite job store with indexes on job id, company, scraped_at and email_sent.
+
+    Each job is kept as a JSON document next to the indexed columns, so new
+    fields need no schema change. Every change runs as a single transaction.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        with self.connection:
+            self.connection.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    identity TEXT PRIMARY KEY,
+                    job_id INTEGER,
+                    company TEXT,
+                    scraped_date TEXT,
+                    email_sent INTEGER NOT NULL DEFAULT 0,
+                    data TEXT NOT NULL,
+                    scraped_at INTEGER
+                )''')
+
+            # Databases created before scraped_at existed get it filled in from scraped_date
+            columns = [row[1] for row in self.connection.execute('PRAGMA table_info(jobs)')]
+            if 'scraped_at' not in columns:
+                self.connection.execute('ALTER TABLE jobs ADD COLUMN scraped_at INTEGER')
+                self.connection.execute("UPDATE jobs SET scraped_at = CAST(strftime('%s', scraped_date, 'utc') AS INTEGER)")
+                # Jobs are read back from data, so the stored documents need the field too
+                self.connection.execute("UPDATE jobs SET data = json_set(data, '$.scraped_at', scraped_at)")
+                self.connection.execute('DROP INDEX IF EXISTS jobs_scraped_date')
+
+            for column in ('job_id', 'company', 'scraped_at', 'email_sent'):
+                self.connection.execute(f'CREATE INDEX IF NOT EXISTS jobs_{column} ON jobs ({column})')
+
+    @staticmethod
+    def _identity(key):
+        return json.dumps(list(key) if isinstance(key, tuple) else key)
+
+    def _row(self, job):
+        return (self._identity(job_identity(job)), job.get('job_id'), job.get('company'), job.get('scraped_date'),
+                scraped_timestamp(job), int(bool(job.get('email_sent'))), json.dumps(job))
+
+    def _query(self, sql, parameters=()):
+        return [json.loads(data) for data, in self.connection.execute(sql, parameters)]
+
+    def load_jobs(self):
+        return self._query('SELECT data FROM jobs ORDER BY scraped_at, rowid')
+
+    def load_jobs_since(self, timestamp):
+        return self._query('SELECT data FROM jobs WHERE scraped_at >= ? ORDER BY scraped_at, rowid', (timestamp,))
+
+    def load_unsent_jobs(self):
+        return self._query('SELECT data FROM jobs WHERE email_sent = 0 ORDER BY scraped_at, rowid')
+
+    def has_job(self, job):
+        """Check whether a job with the same identity is stored, using the primary key."""
+        identity = self._identity(job_identity(job))
+        return self.connection.execute('SELECT 1 FROM jobs WHERE identity = ?', (identity,)).fetchone() is not None
+
+    def upsert_jobs(self, jobs):
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO jobs (identity, job_id, company, scraped_date, scraped_at, email_sent, data) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', [self._row(job) for job in jobs])
+
+    def mark_notified(self, jobs):
+        with self.connection:
+            self.connection.executemany(
+                'UPDATE jobs SET email_sent = 1, data = ? WHERE identity = ?',
+                [(json.dumps(dict(job, email_sent=True)), self._identity(job_identity(job))) for job in jobs])
+
+    def prune_older_than(self, timestamp):
+        with self.connection:
+            self.connection.execute('DELETE FROM jobs WHERE scraped_at < ?', (timestamp,))
+
+    def close(self):
+        self.connection.close()
+
+
+# Storage backends selectable with the 'storage_backend' setting in carwler.json
+JOB_STORES = {
+    'json': ('.json', JsonJobStore),
+    'jsonl': ('.jsonl', JsonlJobStore),
+    'sqlite': ('.sqlite', SqliteJobStore),
+}
+
+
+def open_job_store(path, backend=None):
+    """Open the job store for a database path.
+
+    Without a backend it is chosen from the path's extension; with one, the
+    path's extension is switched to the backend's.
+    """
+    path = str(path)
+    if backend is None:
+        if path.endswith('.jsonl'):
+            backend = 'jsonl'
+        elif path.endswith(('.sqlite', '.sqlite3', '.db')):
+            backend = 'sqlite'
+        else:
+            backend = 'json'
+    elif backend not in JOB_STORES:
+        raise ValueError(f"Unknown storage backend '{backend}', expected one of {', '.join(JOB_STORES)}")
+    else:
+        path = os.path.splitext(path)[0] + JOB_STORES[backend][0]
+
+    return JOB_STORES[backend][1](path)
@@ -1,9 +1,11 @@
 import requests
-from bs4 import BeautifulSoup
 import json
 import os
+import base64
+import subprocess
 import time
 import random
+import bisect
 from datetime import datetime, timedelta
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -11,8 +13,23 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from card_parsers import CARD_SCRIPT, get_card_parser
+from job_store import extract_job_id, job_identity, open_job_store
+from seen_filter import SeenJobFilter
+
+
+def canonical_job_url(url):
+    """Return a short job URL without the volatile tracking parameters."""
+    job_id = extract_job_id(url)
+    if job_id is not None:
+        return f"https://www.linkedin.com/jobs/view/{job_id}/"
+    return url.split('?')[0]
 
 
 class LinkedInJobCrawler:
@@ -28,7 +45,9 @@ class LinkedInJobCrawler:
         if config_file is None:
             config_file = base_dir / "carwler.json"
         
-        database_path = base_dir / "database.json"
+        database_path = base_dir / "database.jsonl"
+        seen_filter_path = base_dir / "state" / "seen_jobs.bin"
+        chromedriver_cache_path = base_dir / "state" / "chromedriver.json"
         
         # Default configuration
         self.config = {
@@ -36,11 +55,43 @@ class LinkedInJobCrawler:
             'keywords': ['python', 'developer', 'engineer', 'data engineer', 'airflow', 'etl', 'aws', 'snowflake', 'databricks'],
             'excluded_keywords': ['5+ years', '4+ years', 'manager', 'director'],
             'database_file': str(database_path),
+            'storage_backend': 'jsonl',  # one of 'json', 'jsonl' or 'sqlite'
+            'retention_hours': 1,  # how long scraped jobs are kept in the job store
+            # Bloom filter of job ids that remembers jobs long after they leave the job store
+            'seen_filter_file': str(seen_filter_path),
+            'seen_filter_capacity': 50000,  # jobs per generation
+            'seen_filter_false_positive_rate': 0.001,
+            'seen_filter_rotation_days': 14,
             'user_agents': [
                 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
                 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15',
                 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36'
             ],
+            'fetch_mode': 'http',  # 'http' for the guest job-search endpoint, 'selenium' for headless Chrome
+            'selenium_fallback': False,  # retry with Selenium when the HTTP fetcher fails
+            'guest_search_url': 'https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search',
+            'http_max_pages': 10,
+            'http_timeout': 10,
+            # Selenium waits, in seconds, for the first cards and for each scroll to load more
+            'page_load_timeout': 15,
+            'scroll_timeout': 5,
+            'max_scrolls': 5,
+            # Resolved ChromeDriver path, reinstalled only when Chrome's version changes
+            'chromedriver_cache_file': str(chromedriver_cache_path),
+            # Keep headless Chrome from downloading resources the parser never uses
+            'block_resources': True,
+            'blocked_url_patterns': [
+                '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+                '*.woff', '*.woff2', '*.ttf', '*.otf', '*.css', '*.mp4',
+                '*media.licdn.com*', '*px.ads.linkedin.com*', '*/li/track*',
+                '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*'
+            ],
+            # Stop scrolling, paging and parsing after this many consecutive already-seen jobs (0 disables)
+            'stop_after_seen': 5,
+            'parser_backend': 'lxml',  # one of 'lxml', 'selectolax' or 'bs4'
+            # 'script' reads card fields in the browser, 'page_source' parses the serialized page,
+            # 'network' parses the search page and result fragments the browser downloaded
+            'selenium_extraction': 'script',
             'request_delay': {
                 'min_seconds': 2,
                 'max_seconds': 5
@@ -61,11 +112,41 @@ class LinkedInJobCrawler:
             with open(config_file, 'w') as f:
                 json.dump(self.config, f, indent=4)
                 
-        # Initialize the webdriver
+        # Initialize the webdriver and HTTP session
         self.driver = None
+        self.session = None
+        
+        # Extracts the fields of every job card from a page or fragment
+        self.card_parser = get_card_parser(self.config['parser_backend'])
+        
+        # Already-seen job cards skipped during the current crawl
+        self.skipped_seen_jobs = 0
         
-        # Load previous jobs
+        # Jobs scraped before this epoch time are dropped on the next save
+        self.retention_cutoff = None
+
+        # Job storage backend shared with the matcher
+        self.store = open_job_store(self.config['database_file'], self.config.get('storage_backend'))
+
+        # Load the previous jobs still inside the retention window and index them by identity
+        # for constant-time dedup. Stores that can look a job up by identity (SQLite) answer
+        # dedup queries from their index instead, so no identity set is built for them.
         self.previous_jobs = self.load_previous_jobs()
+        self.store_has_job = getattr(self.store, 'has_job', None)
+        if self.store_has_job is None:
+            self.seen_jobs = {job_identity(job) for job in self.previous_jobs}
+        else:
+            self.seen_jobs = set()
+
+        # Compact history of every job seen in the last few weeks
+        self.seen_filter = SeenJobFilter(
+            self.config['seen_filter_file'],
+            capacity=self.config['seen_filter_capacity'],
+            false_positive_rate=self.config['seen_filter_false_positive_rate'],
+            rotation_days=self.config['seen_filter_rotation_days'])
+        self.seen_filter.load()
+        for job in self.previous_jobs:
+            self.seen_filter.add(job_identity(job))
 
         
     def setup_driver(self):
@@ -88,42 +169,104 @@ class LinkedInJobCrawler:
         user_agent = random.choice(self.config['user_agents'])
         chrome_options.add_argument(f"--user-agent={user_agent}")
         
+        if self.config['block_resources']:
+            # Images are switched off in the profile; other resources are blocked by URL below
+            chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        
+        if self.config['selenium_extraction'] == 'network':
+            # Network events go to the performance log, where the job-list responses are picked up
+            chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        
         try:
-            self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+            self.driver = webdriver.Chrome(service=Service(self.chromedriver_path()), options=chrome_options)
         except Exception as e:
             print(f"Error setting up Chrome driver: {e}")
+            # Resolve the driver again on the next setup in case the cached one is broken
+            try:
+                os.remove(self.config['chromedriver_cache_file'])
+            except OSError:
+                pass
             print("Trying with direct ChromeDriver...")
             self.driver = webdriver.Chrome(options=chrome_options)
             
+        if self.config['block_resources']:
+            self.block_resources()
+            
+    def chrome_version(self):
+        """Return the installed Chrome's version string, or None if Chrome cannot be run."""
+        for binary in ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser'):
+            try:
+                result = subprocess.run([binary, '--version'], capture_output=True, text=True, timeout=10)
+            except (OSError, subprocess.SubprocessError):
+                continue
+            if result.returncode == 0 and result.stdout.strip():
+                return result.stdout.strip()
+        return None
+        
+    def chromedriver_path(self):
+        """Return the ChromeDriver path, calling ChromeDriverManager only when Chrome's version changed."""
+        cache_file = self.config['chromedriver_cache_file']
+        version = self.chrome_version()
+        try:
+            with open(cache_file, 'r') as f:
+                cached = json.load(f)
+            if version is not None and cached['chrome_version'] == version and os.path.exists(cached['driver_path']):
+                return cached['driver_path']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+            
+        driver_path = ChromeDriverManager().install()
+        
+        # Without a known Chrome version the cached path could not be checked later, so skip saving it
+        if version is not None:
+            try:
+                os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+                temp_path = cache_file + '.tmp'
+                with open(temp_path, 'w') as f:
+                    json.dump({'chrome_version': version, 'driver_path': driver_path}, f, indent=4)
+                os.replace(temp_path, cache_file)
+            except OSError as e:
+                print(f"Error saving ChromeDriver path: {e}")
+        return driver_path
+        
+    def block_resources(self):
+        """Block fonts, stylesheets, media and trackers for the browser session over CDP."""
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.config['blocked_url_patterns']})
+        except Exception as e:
+            print(f"Error blocking resources: {e}")
+            
     def load_previous_jobs(self):
-        """Load previously scraped jobs from database file."""
-        if not os.path.exists(self.config['database_file']):
-            return []
+        """Load the previously scraped jobs within the retention window from the job store."""
+        cutoff = int((datetime.now() - timedelta(hours=self.config['retention_hours'])).timestamp())
         try:
-            with open(self.config['database_file'], 'r') as f:
-                return json.load(f)
+            return self.store.load_jobs_since(cutoff)
         except Exception as e:
             print(f"Error loading previous jobs: {e}")
             return []
             
-    def save_jobs(self, jobs):
-        """Save jobs to the database file."""
+    def save_jobs(self, new_jobs):
+        """Drop jobs past the retention window and save new jobs to the job store."""
         try:
-            with open(self.config['database_file'], 'w') as f:
-                json.dump(jobs, f, indent=4)
-            print(f"Jobs saved to {self.config['database_file']}")
+            if self.retention_cutoff is not None:
+                self.store.prune_older_than(self.retention_cutoff)
+            self.store.upsert_jobs(new_jobs)
+            print(f"Jobs saved to {self.store.path}")
         except Exception as e:
             print(f"Error saving jobs: {e}")
+        try:
+            self.seen_filter.save()
+        except Exception as e:
+            print(f"Error saving seen-job filter: {e}")
             
     def is_new_job(self, job):
-        """Check if a job is new by comparing with previous jobs."""
-        for prev_job in self.previous_jobs:
-            # Compare key fields to determine if it's the same job
-            if (job['title'] == prev_job['title'] and 
-                job['company'] == prev_job['company'] and
-                job['location'] == prev_job['location']):
-                return False
-        return True
+        """Check if a job is new by looking up its identity among previous and long-term seen jobs."""
+        identity = job_identity(job)
+        if identity in self.seen_jobs or identity in self.seen_filter:
+            return False
+        return self.store_has_job is None or not self.store_has_job(job)
         
     def is_job_relevant(self, job_title):
         """Check if job title contains desired keywords and not excluded keywords."""
@@ -137,7 +280,203 @@ class LinkedInJobCrawler:
         
         return has_keyword and not has_excluded
         
+    def is_seen_job_url(self, job_url):
+        """Check if a job URL carries the id of a job that was already seen."""
+        job_id = extract_job_id(job_url)
+        return job_id is not None and (job_id in self.seen_jobs or job_id in self.seen_filter)
+        
+    def reached_seen_jobs(self, job_urls):
+        """Check if the configured number of consecutive already-seen jobs appears in job_urls."""
+        stop_after_seen = self.config['stop_after_seen']
+        seen_run = 0
+        for job_url in job_urls:
+            seen_run = seen_run + 1 if self.is_seen_job_url(job_url) else 0
+            if stop_after_seen and seen_run >= stop_after_seen:
+                return True
+        return False
+        
+    def parse_job_cards(self, html):
+        """Parse LinkedIn job cards from a search results page or fragment.
+
+        Returns (jobs, reached_seen, card_count) as jobs_from_cards does. The
+        page is parsed in full, but the fields of cards after an early stop
+        are never extracted.
+        """
+        return self.jobs_from_cards(self.card_parser(html))
+        
+    def jobs_from_cards(self, cards):
+        """Build relevant job records from extracted card fields.
+
+        Returns (jobs, reached_seen, card_count): reading stops early, with
+        reached_seen set, once stop_after_seen consecutive cards are jobs that
+        were already seen, and card_count is the number of cards read.
+        """
+        jobs = []
+        stop_after_seen = self.config['stop_after_seen']
+        seen_run = 0
+        card_count = 0
+        for card in cards:
+            card_count += 1
+            try:
+                job_url = card['url'] or ""
+                
+                # Results are newest first, so a run of known jobs means the rest are known too
+                if stop_after_seen and self.is_seen_job_url(job_url):
+                    seen_run += 1
+                    self.skipped_seen_jobs += 1
+                    if seen_run >= stop_after_seen:
+                        print(f"Reached {seen_run} already-seen jobs in a row after {card_count} job cards, "
+                              f"skipping the rest")
+                        return jobs, True, card_count
+                    continue
+                seen_run = 0
+                
+                title = card['title']
+                if title is None:
+                    continue
+                    
+                if not self.is_job_relevant(title):
+                    continue
+                    
+                company = card['company'] if card['company'] is not None else "Unknown Company"
+                location = card['location'] if card['location'] is not None else "Unknown Location"
+                
+                # LinkedIn typically shows the posting date as "1d ago", "2h ago", etc.
+                date_posted = card['date_posted'] if card['date_posted'] is not None else "Recent"
+                
+                # Only add if we have a valid URL
+                if job_url:
+                    scraped_at = datetime.now()
+                    jobs.append({
+                        'job_id': extract_job_id(job_url),
+                        'title': title,
+                        'company': company,
+                        'location': location,
+                        'date_posted': date_posted,
+                        'posted_date': card['posted_date'],
+                        'url': canonical_job_url(job_url),
+                        'source': 'LinkedIn',
+                        'scraped_date': scraped_at.strftime("%Y-%m-%d %H:%M:%S"),
+                        'scraped_at': int(scraped_at.timestamp())
+                    })
+                    print(f"Found job: {title} at {company}")
+            except Exception as e:
+                print(f"Error extracting job data: {e}")
+                
+        print(f"Found {card_count} job cards on the page")
+        return jobs, False, card_count
+        
+    def setup_session(self):
+        """Set up a pooled HTTP session for LinkedIn's guest job search endpoint."""
+        self.session = requests.Session()
+        retries = Retry(total=2, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
+        self.session.mount('https://', HTTPAdapter(pool_maxsize=4, max_retries=retries))
+        self.session.mount('http://', HTTPAdapter(pool_maxsize=4, max_retries=retries))
+        self.session.headers['User-Agent'] = random.choice(self.config['user_agents'])
+        
+    def scrape_linkedin_jobs_http(self):
+        """Scrape job data from the guest search-results fragments, without a browser."""
+        if self.session is None:
+            self.setup_session()
+            
+        # The guest endpoint takes the same filters as the search page, paginated with start=
+        params = dict(parse_qsl(urlsplit(self.config['job_url']).query))
+        jobs = []
+        start = 0
+        
+        for page in range(self.config['http_max_pages']):
+            if page > 0:
+                delay = self.config['request_delay']
+                time.sleep(random.uniform(delay['min_seconds'], delay['max_seconds']))
+                
+            print(f"Fetching LinkedIn jobs from: {self.config['guest_search_url']} (start={start})")
+            try:
+                response = self.session.get(self.config['guest_search_url'], params={**params, 'start': start},
+                                            timeout=self.config['http_timeout'])
+                
+                # The endpoint answers past the last page with an error or an empty fragment
+                if response.status_code in (400, 404) or not response.text.strip():
+                    break
+                response.raise_for_status()
+            except requests.RequestException as e:
+                # Only a failed first page leaves nothing to keep, so only then is the error raised
+                if page == 0:
+                    raise
+                print(f"Error fetching LinkedIn jobs at start={start}, keeping {len(jobs)} jobs from earlier pages: {e}")
+                break
+            
+            page_jobs, reached_seen, card_count = self.parse_job_cards(response.text)
+            jobs.extend(page_jobs)
+            if card_count == 0 or reached_seen:
+                break
+            start += card_count
+            
+        return jobs
+        
     def scrape_linkedin_jobs(self):
+        """Scrape job data from LinkedIn with the configured fetcher."""
+        if self.config['fetch_mode'] == 'http':
+            try:
+                return self.scrape_linkedin_jobs_http()
+            except Exception as e:
+                print(f"Error scraping LinkedIn over HTTP: {e}")
+                if not self.config['selenium_fallback']:
+                    return []
+                print("Falling back to Selenium...")
+        return self.scrape_linkedin_jobs_selenium()
+        
+    def count_job_cards(self):
+        """Return the number of job cards currently rendered in the browser."""
+        return self.driver.execute_script("return document.querySelectorAll('div.base-card').length")
+        
+    def job_card_urls(self):
+        """Return the job links of the cards currently rendered in the browser, in page order."""
+        return self.driver.execute_script(
+            "return Array.from(document.querySelectorAll('div.base-card a.base-card__full-link'), a => a.href)")
+        
+    def captured_job_responses(self):
+        """Return the bodies of the search pages and result fragments the browser loaded, in load order."""
+        fragment_path = urlsplit(self.config['guest_search_url']).path
+        responses = {}
+        finished = set()
+        for entry in self.driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            params = message.get('params', {})
+            if message['method'] == 'Network.responseReceived':
+                if params.get('type') == 'Document' or fragment_path in params['response']['url']:
+                    responses[params['requestId']] = params['response']['url']
+            elif message['method'] == 'Network.loadingFinished':
+                finished.add(params['requestId'])
+                
+        bodies = []
+        for request_id, url in responses.items():
+            if request_id not in finished:
+                continue
+            try:
+                response = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+            except Exception as e:
+                print(f"Error reading response body of {url}: {e}")
+                continue
+            body = response['body']
+            if response.get('base64Encoded'):
+                body = base64.b64decode(body).decode('utf-8', errors='replace')
+            bodies.append(body)
+        return bodies
+        
+    def extract_job_cards(self):
+        """Return the fields of the job cards loaded in the browser, in page order."""
+        if self.config['selenium_extraction'] == 'network':
+            bodies = self.captured_job_responses()
+            if bodies:
+                return (card for body in bodies for card in self.card_parser(body))
+            print("No job responses were captured, reading the cards from the page")
+            return self.driver.execute_script(CARD_SCRIPT)
+        if self.config['selenium_extraction'] == 'script':
+            # One round trip returning only the card fields, instead of the whole DOM
+            return self.driver.execute_script(CARD_SCRIPT)
+        return self.card_parser(self.driver.page_source)
+        
+    def scrape_linkedin_jobs_selenium(self):
         """Scrape job data from LinkedIn."""
         jobs = []
         try:
@@ -147,73 +486,33 @@ class LinkedInJobCrawler:
             print(f"Fetching LinkedIn jobs from: {self.config['job_url']}")
             self.driver.get(self.config['job_url'])
             
-            # Wait for page to load
-            time.sleep(5)
+            # Wait until the first job cards are rendered rather than for a fixed time
+            try:
+                WebDriverWait(self.driver, self.config['page_load_timeout']).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, 'div.base-card')))
+            except TimeoutException:
+                print("No job cards appeared before the page load timeout")
             
             # Scroll down to load more results (LinkedIn uses infinite scroll)
             print("Scrolling to load more job listings...")
-            scroll_count = 0
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
+            card_count = self.count_job_cards()
             
-            while scroll_count < 5:  # Limit scrolling to 5 times
+            for _ in range(self.config['max_scrolls']):
+                # Stop once the newest-first list has reached jobs from earlier runs
+                if self.config['stop_after_seen'] and self.reached_seen_jobs(self.job_card_urls()):
+                    break
+
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
+                try:
+                    # Continue as soon as the next batch of cards has been appended
+                    WebDriverWait(self.driver, self.config['scroll_timeout']).until(
+                        lambda driver: self.count_job_cards() > card_count)
+                except TimeoutException:
                     break
-                last_height = new_height
-                scroll_count += 1
+                card_count = self.count_job_cards()
                 
-            # Get the page source after JavaScript execution
-            html = self.driver.page_source
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # LinkedIn job cards
-            job_cards = soup.find_all('div', class_='base-card')
-            print(f"Found {len(job_cards)} job cards on the page")
-            
-            for card in job_cards:
-                try:
-                    # Extract job title
-                    title_element = card.find('h3', class_='base-search-card__title')
-                    if not title_element:
-                        continue
-                        
-                    title = title_element.text.strip()
-                    
-                    if not self.is_job_relevant(title):
-                        continue
-                        
-                    # Extract company name
-                    company_element = card.find('h4', class_='base-search-card__subtitle')
-                    company = company_element.text.strip() if company_element else "Unknown Company"
-                    
-                    # Extract location
-                    location_element = card.find('span', class_='job-search-card__location')
-                    location = location_element.text.strip() if location_element else "Unknown Location"
-                    
-                    # Extract job URL
-                    link_element = card.find('a', class_='base-card__full-link', href=True)
-                    job_url = link_element['href'] if link_element and 'href' in link_element.attrs else ""
-                    
-                    # Extract posting date (LinkedIn typically shows "1d ago", "2h ago", etc.)
-                    date_element = card.find('time', class_='job-search-card__listdate')
-                    date_posted = date_element.text.strip() if date_element else "Recent"
-                    
-                    # Only add if we have a valid URL
-                    if job_url:
-                        jobs.append({
-                            'title': title,
-                            'company': company,
-                            'location': location,
-                            'date_posted': date_posted,
-                            'url': job_url,
-                            'source': 'LinkedIn',
-                            'scraped_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        })
-                        print(f"Found job: {title} at {company}")
-                except Exception as e:
-                    print(f"Error extracting job data: {e}")
+            # Extract the cards after JavaScript execution
+            jobs, _, _ = self.jobs_from_cards(self.extract_job_cards())
             
         except Exception as e:
             print(f"Error scraping LinkedIn: {e}")
@@ -226,12 +525,13 @@ class LinkedInJobCrawler:
             
         return jobs
         
-    def run_once(self):
-        """Run the LinkedIn job crawler once."""
+    def update_jobs(self):
+        """Scrape LinkedIn and return (all_jobs, new_jobs) without saving them."""
         print(f"Starting LinkedIn job scraping at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"Looking for jobs posted in the last 24 hours matching 'python developer'")
         
-        # Scrape LinkedIn jobs
+        # Scrape LinkedIn jobs, counting the already-seen cards skipped on the way
+        self.skipped_seen_jobs = 0
         current_jobs = self.scrape_linkedin_jobs()
         
         # Identify new jobs
@@ -240,23 +540,33 @@ class LinkedInJobCrawler:
             if self.is_new_job(job):
                 job['email_sent'] = False
                 new_jobs.append(job)
+                self.seen_jobs.add(job_identity(job))
+                self.seen_filter.add(job_identity(job))
         
 
-        one_hour_ago = datetime.now() - timedelta(hours=1)
-        filtered_previous_jobs = [
-            job for job in self.previous_jobs 
-            if datetime.strptime(job['scraped_date'], '%Y-%m-%d %H:%M:%S') >= one_hour_ago
-]
-        all_jobs = filtered_previous_jobs + new_jobs
-        self.save_jobs(all_jobs)
-        
-        print(f"\nFound {len(current_jobs)} total job listings")
+        # Previous jobs are in scrape order, so the retention cutoff is found by bisection
+        self.retention_cutoff = int((datetime.now() - timedelta(hours=self.config['retention_hours'])).timestamp())
+        start = bisect.bisect_left(self.previous_jobs, self.retention_cutoff, key=lambda job: job['scraped_at'])
+        all_jobs = self.previous_jobs[start:] + new_jobs
+        
+        print(f"\nRead {len(current_jobs) + self.skipped_seen_jobs} job listings "
+              f"({self.skipped_seen_jobs} already seen and skipped)")
         print(f"Identified {len(new_jobs)} new job postings")
         
+        return all_jobs, new_jobs
+        
+    def run_once(self):
+        """Run the LinkedIn job crawler once."""
+        all_jobs, new_jobs = self.update_jobs()
+        self.save_jobs(new_jobs)
         return new_jobs
         
     def cleanup(self):
         """Clean up resources."""
+        self.store.close()
+        if self.session:
+            self.session.close()
+            self.session = None
         if self.driver:
             try:
                 self.driver.quit()
@@ -0,0 +1,51 @@
+from linkedin_crawler import LinkedInJobCrawler
+
+
+def run_pipeline(crawler, matcher=None):
+    """Crawl LinkedIn, match unsent jobs in memory and save the results to the job store."""
+    all_jobs, new_jobs = crawler.update_jobs()
+    notified_jobs = []
+
+    # Jobs whose email failed or never went out on earlier runs are retried alongside the new ones
+    pending = [job for job in all_jobs if not job.get('email_sent')]
+    if pending:
+        # A matching failure must not lose the crawl, which is saved below either way
+        try:
+            # The matcher pulls in pandas/scikit-learn, so it is only imported when there is work for it
+            from tfidf_matcher import JobMatcher, notify
+
+            if matcher is None:
+                matcher = JobMatcher()
+            matches = matcher.match_batch(pending)
+            if notify(matches):
+                notified_jobs = [record for record, _ in matches]
+        except Exception as e:
+            print(f"Error matching jobs: {e}")
+    else:
+        print("No unsent jobs, skipping employer matching")
+
+    crawler.save_jobs(new_jobs)
+    if notified_jobs:
+        try:
+            crawler.store.mark_notified(notified_jobs)
+        except Exception as e:
+            print(f"Error flagging emailed jobs: {e}")
+    return new_jobs
+
+
+# Run the crawler and matcher once in a single process
+if __name__ == "__main__":
+    try:
+        print("=== LinkedIn Job Crawler and H-1B Matcher ===")
+        crawler = LinkedInJobCrawler()
+        new_jobs = run_pipeline(crawler)
+        print(f"\nPipeline finished with {len(new_jobs)} new jobs")
+
+    except KeyboardInterrupt:
+        print("\nPipeline stopped by user")
+    except Exception as e:
+        print(f"\nError in pipeline: {e}")
+    finally:
+        # Clean up resources
+        if 'crawler' in locals():
+            crawler.cleanup()
@@ -0,0 +1,97 @@
+import hashlib
+import math
+import os
+import struct
+import time
+
+
+class SeenJobFilter:
+    """Persisted Bloom filter of job identities that outlives the job store's retention window.
+
+    Two generations are kept: new identities go into the current one, and
+    lookups check both. When the current generation is full or older than
+    the rotation period it becomes the previous one and a fresh generation
+    starts, so jobs are remembered for one to two rotation periods.
+    """
+
+    HEADER = struct.Struct('<4sIIIIQ')  # magic, bits, hashes, capacity, items in current, rotated at
+    MAGIC = b'SJF1'
+
+    def __init__(self, path, capacity=50000, false_positive_rate=0.001, rotation_days=14):
+        self.path = path
+        self.capacity = capacity
+        self.rotation_seconds = rotation_days * 24 * 60 * 60
+
+        # Standard Bloom filter sizing for the capacity and false-positive rate of one generation
+        self.num_bits = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+
+        self.current = bytearray((self.num_bits + 7) // 8)
+        self.previous = bytearray(len(self.current))
+        self.count = 0
+        self.rotated_at = int(time.time())
+
+    def _positions(self, identity):
+        # Double hashing: k bit positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(repr(identity).encode('utf-8'), digest_size=16).digest()
+        first, second = struct.unpack('<QQ', digest)
+        return [(first + i * second) % self.num_bits for i in range(self.num_hashes)]
+
+    @staticmethod
+    def _contains(bits, positions):
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in positions)
+
+    def __contains__(self, identity):
+        positions = self._positions(identity)
+        return self._contains(self.current, positions) or self._contains(self.previous, positions)
+
+    def add(self, identity):
+        """Remember an identity, returning False if it was already in the current generation."""
+        positions = self._positions(identity)
+        if self._contains(self.current, positions):
+            return False
+        for position in positions:
+            self.current[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+        if self.count >= self.capacity:
+            self.rotate()
+        return True
+
+    def rotate(self):
+        """Start a new generation, keeping the current one as the previous."""
+        self.previous = self.current
+        self.current = bytearray(len(self.previous))
+        self.count = 0
+        self.rotated_at = int(time.time())
+
+    def load(self):
+        """Read the filter from disk, starting empty if it is missing or was sized differently."""
+        try:
+            with open(self.path, 'rb') as f:
+                magic, num_bits, num_hashes, capacity, count, rotated_at = self.HEADER.unpack(f.read(self.HEADER.size))
+                current = bytearray(f.read(len(self.current)))
+                previous = bytearray(f.read(len(self.previous)))
+        except (OSError, struct.error) as e:
+            if os.path.exists(self.path):
+                print(f"Error loading seen-job filter: {e}")
+            return
+
+        if (magic, num_bits, num_hashes, capacity) != (self.MAGIC, self.num_bits, self.num_hashes, self.capacity) \
+                or len(current) != len(self.current) or len(previous) != len(self.previous):
+            print("Seen-job filter settings changed, starting a new filter")
+            return
+
+        self.current, self.previous, self.count, self.rotated_at = current, previous, count, rotated_at
+        if time.time() - self.rotated_at >= self.rotation_seconds:
+            self.rotate()
+
+    def save(self):
+        """Atomically write the filter to disk."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.num_bits, self.num_hashes, self.capacity,
+                                     self.count, self.rotated_at))
+            f.write(self.current)
+            f.write(self.previous)
+        os.replace(temp_path, self.path)
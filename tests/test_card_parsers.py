@@ -0,0 +1,47 @@
+import pytest
+
+from card_parsers import (BACKEND_AVAILABLE, CARD_FIELDS, CARD_PARSERS, parse_cards_bs4, parse_cards_lxml,
+                          parse_cards_selectolax)
+from conftest import read_fixture
+
+FIXTURES = ['guest_search_page1.html', 'guest_search_page2.html']
+
+
+def test_bs4_extracts_card_fields():
+    cards = list(parse_cards_bs4(read_fixture('guest_search_page1.html')))
+
+    assert len(cards) == 4
+    assert all(set(card) == set(CARD_FIELDS) for card in cards)
+    assert cards[0] == {
+        'url': 'https://www.linkedin.com/jobs/view/data-engineer-at-acme-analytics-4250137687?position=1&pageNum=0'
+               '&refId=Tq1a%2F2xkQ8SvI0uYzS1R0w%3D%3D&trackingId=n8y4Vd6LpZc%2BkY2y9Nf%2FXg%3D%3D',
+        'title': 'Data Engineer',
+        'company': 'Acme Analytics',
+        'location': 'Austin, TX',
+        'date_posted': '12 minutes ago',
+        'posted_date': '2025-06-16',
+    }
+    assert cards[1]['title'] == 'ETL Developer (Python & Airflow)'
+    assert cards[1]['company'] == 'Smith & Jones LLP'
+    assert cards[1]['date_posted'] == '1 day ago'
+    assert cards[2]['company'] is None
+    assert cards[2]['date_posted'] is None and cards[2]['posted_date'] is None
+
+
+@pytest.mark.parametrize('fixture', FIXTURES)
+@pytest.mark.parametrize('backend, parser', [
+    pytest.param('lxml', parse_cards_lxml,
+                 marks=pytest.mark.skipif(not BACKEND_AVAILABLE['lxml'], reason='lxml is not installed')),
+    pytest.param('selectolax', parse_cards_selectolax,
+                 marks=pytest.mark.skipif(not BACKEND_AVAILABLE['selectolax'], reason='selectolax is not installed')),
+])
+def test_backends_match_bs4(backend, parser, fixture):
+    html = read_fixture(fixture)
+    assert list(parser(html)) == list(parse_cards_bs4(html))
+
+
+@pytest.mark.parametrize('backend', sorted(CARD_PARSERS))
+def test_empty_fragment_has_no_cards(backend):
+    if not BACKEND_AVAILABLE[backend]:
+        pytest.skip(f'{backend} is not installed')
+    assert list(CARD_PARSERS[backend]('')) == []
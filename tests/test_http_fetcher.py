@@ -0,0 +1,113 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from conftest import read_fixture
+from linkedin_crawler import LinkedInJobCrawler
+
+
+class GuestSearchHandler(BaseHTTPRequestHandler):
+    """Stand-in for the guest job-search endpoint, serving one fixture per start offset."""
+
+    pages = {}
+    past_last_page = 400
+    requested_starts = []
+
+    def do_GET(self):
+        start = int(parse_qs(urlsplit(self.path).query)['start'][0])
+        self.requested_starts.append(start)
+        if start in self.pages:
+            status, body = 200, self.pages[start].encode('utf-8')
+        elif self.past_last_page == 200:
+            status, body = 200, b''
+        else:
+            status, body = self.past_last_page, b'Bad Request'
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def guest_search_server():
+    GuestSearchHandler.pages = {0: read_fixture('guest_search_page1.html'), 4: read_fixture('guest_search_page2.html')}
+    GuestSearchHandler.requested_starts = []
+    server = HTTPServer(('127.0.0.1', 0), GuestSearchHandler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/jobs-guest/jobs/api/seeMoreJobPostings/search'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def crawler(tmp_path, monkeypatch, guest_search_server):
+    monkeypatch.chdir(tmp_path)
+    config_file = tmp_path / 'data' / 'carwler.json'
+    config_file.parent.mkdir()
+    config_file.write_text(json.dumps({
+        'database_file': str(tmp_path / 'data' / 'database.jsonl'),
+        'seen_filter_file': str(tmp_path / 'data' / 'state' / 'seen_jobs.bin'),
+        'guest_search_url': guest_search_server,
+        'request_delay': {'min_seconds': 0, 'max_seconds': 0},
+    }))
+    crawler = LinkedInJobCrawler(config_file)
+    yield crawler
+    crawler.cleanup()
+
+
+@pytest.mark.parametrize('past_last_page', [400, 200])
+def test_pages_through_results_until_the_endpoint_runs_out(crawler, past_last_page):
+    GuestSearchHandler.past_last_page = past_last_page
+
+    jobs = crawler.scrape_linkedin_jobs_http()
+
+    # Offsets advance by the cards parsed on each page; the manager posting is excluded by keyword
+    assert GuestSearchHandler.requested_starts == [0, 4, 6]
+    assert [job['job_id'] for job in jobs] == [4250137687, 4250139912, 4250140188, 4250141107, 4250141260]
+    assert jobs[0]['url'] == 'https://www.linkedin.com/jobs/view/4250137687/'
+    assert jobs[1]['company'] == 'Smith & Jones LLP'
+    assert jobs[2]['company'] == 'Initech, Inc.'
+
+
+def test_stops_paging_at_already_seen_jobs(crawler):
+    GuestSearchHandler.past_last_page = 400
+    crawler.config['stop_after_seen'] = 2
+    crawler.seen_jobs.update({4250137687, 4250139912})
+
+    assert crawler.scrape_linkedin_jobs_http() == []
+    assert GuestSearchHandler.requested_starts == [0]
+
+
+def without_retries(crawler):
+    crawler.setup_session()
+    crawler.session.mount('http://', HTTPAdapter(max_retries=0))
+
+
+def test_keeps_earlier_pages_when_a_later_page_fails(crawler):
+    GuestSearchHandler.past_last_page = 503
+    without_retries(crawler)
+
+    jobs = crawler.scrape_linkedin_jobs_http()
+
+    assert GuestSearchHandler.requested_starts == [0, 4, 6]
+    assert len(jobs) == 5
+
+
+def test_first_page_failure_is_raised(crawler):
+    GuestSearchHandler.pages = {}
+    GuestSearchHandler.past_last_page = 503
+    without_retries(crawler)
+
+    with pytest.raises(requests.HTTPError):
+        crawler.scrape_linkedin_jobs_http()
+    assert crawler.scrape_linkedin_jobs() == []
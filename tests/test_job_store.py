@@ -0,0 +1,125 @@
+import json
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from job_store import JOB_STORES, JsonlJobStore, SqliteJobStore, open_job_store
+
+BASE_TIME = 1750000000
+
+
+def make_job(job_id, scraped_at, title='Data Engineer'):
+    return {
+        'job_id': job_id,
+        'title': title,
+        'company': 'Acme Analytics',
+        'location': 'Austin, TX',
+        'url': f'https://www.linkedin.com/jobs/view/{job_id}/',
+        'scraped_date': datetime.fromtimestamp(scraped_at).strftime('%Y-%m-%d %H:%M:%S'),
+        'scraped_at': scraped_at,
+        'email_sent': False,
+    }
+
+
+@pytest.mark.parametrize('backend', sorted(JOB_STORES))
+def test_changes_survive_a_reopen(tmp_path, backend):
+    path = tmp_path / 'database.json'
+    store = open_job_store(path, backend)
+    store.upsert_jobs([make_job(1, BASE_TIME), make_job(2, BASE_TIME + 60), make_job(3, BASE_TIME + 120)])
+    store.upsert_jobs([make_job(3, BASE_TIME + 120, title='Senior Data Engineer')])
+    store.mark_notified([make_job(2, BASE_TIME + 60)])
+    store.prune_older_than(BASE_TIME + 30)
+    store.close()
+
+    store = open_job_store(path, backend)
+    jobs = store.load_jobs()
+    assert [job['job_id'] for job in jobs] == [2, 3]
+    assert [job['email_sent'] for job in jobs] == [True, False]
+    assert jobs[1]['title'] == 'Senior Data Engineer'
+    assert [job['job_id'] for job in store.load_unsent_jobs()] == [3]
+    assert [job['job_id'] for job in store.load_jobs_since(BASE_TIME + 90)] == [3]
+    store.close()
+
+
+def test_jobs_are_returned_in_scrape_order(tmp_path):
+    store = JsonlJobStore(str(tmp_path / 'database.jsonl'))
+    store.upsert_jobs([make_job(1, BASE_TIME + 120), make_job(2, BASE_TIME)])
+    store.upsert_jobs([make_job(3, BASE_TIME + 60)])
+
+    assert [job['job_id'] for job in JsonlJobStore(store.path).load_jobs()] == [2, 3, 1]
+
+
+def test_jsonl_skips_a_torn_line_and_keeps_appending(tmp_path):
+    path = str(tmp_path / 'database.jsonl')
+    JsonlJobStore(path).upsert_jobs([make_job(1, BASE_TIME)])
+    with open(path, 'a') as f:
+        f.write('{"op": "add", "job": {"job_id": 2, "ti')
+
+    store = JsonlJobStore(path)
+    assert [job['job_id'] for job in store.load_jobs()] == [1]
+    store.upsert_jobs([make_job(3, BASE_TIME + 60)])
+
+    assert [job['job_id'] for job in JsonlJobStore(path).load_jobs()] == [1, 3]
+
+
+def test_jsonl_compacts_a_long_log(tmp_path):
+    path = str(tmp_path / 'database.jsonl')
+    store = JsonlJobStore(path, compact_ratio=2, min_compact_lines=4)
+    for _ in range(10):
+        store.upsert_jobs([make_job(1, BASE_TIME), make_job(2, BASE_TIME + 60)])
+        store.mark_notified([make_job(1, BASE_TIME)])
+
+    with open(path) as f:
+        events = [json.loads(line) for line in f]
+    assert len(events) <= 4
+    jobs = JsonlJobStore(path).load_jobs()
+    assert [job['job_id'] for job in jobs] == [1, 2]
+    assert [job['email_sent'] for job in jobs] == [True, False]
+
+
+def test_jsonl_imports_a_legacy_json_database(tmp_path):
+    legacy_job = make_job(1, BASE_TIME)
+    del legacy_job['scraped_at']
+    (tmp_path / 'database.json').write_text(json.dumps([legacy_job]))
+
+    jobs = JsonlJobStore(str(tmp_path / 'database.jsonl')).load_jobs()
+
+    assert [job['job_id'] for job in jobs] == [1]
+    assert jobs[0]['scraped_at'] == BASE_TIME
+    assert (tmp_path / 'database.jsonl').exists()
+    assert [job['job_id'] for job in JsonlJobStore(str(tmp_path / 'database.jsonl')).load_jobs()] == [1]
+
+
+def test_sqlite_migrates_a_table_without_scraped_at(tmp_path):
+    path = str(tmp_path / 'database.sqlite')
+    legacy_job = make_job(1, BASE_TIME)
+    del legacy_job['scraped_at']
+    connection = sqlite3.connect(path)
+    with connection:
+        connection.execute('''
+            CREATE TABLE jobs (
+                identity TEXT PRIMARY KEY,
+                job_id INTEGER,
+                company TEXT,
+                scraped_date TEXT,
+                email_sent INTEGER NOT NULL DEFAULT 0,
+                data TEXT NOT NULL
+            )''')
+        connection.execute('CREATE INDEX jobs_scraped_date ON jobs (scraped_date)')
+        connection.execute('INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?)',
+                           ('1', 1, 'Acme Analytics', legacy_job['scraped_date'], 0, json.dumps(legacy_job)))
+    connection.close()
+
+    store = SqliteJobStore(path)
+    jobs = store.load_jobs()
+    assert jobs[0]['scraped_at'] == BASE_TIME
+    assert store.connection.execute('SELECT scraped_at FROM jobs').fetchall() == [(BASE_TIME,)]
+    indexes = {name for name, in store.connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert 'jobs_scraped_at' in indexes and 'jobs_scraped_date' not in indexes
+    assert store.has_job(make_job(1, BASE_TIME)) and not store.has_job(make_job(2, BASE_TIME))
+
+    store.upsert_jobs([make_job(2, BASE_TIME + 60)])
+    store.prune_older_than(BASE_TIME + 30)
+    assert [job['job_id'] for job in store.load_jobs()] == [2]
+    store.close()
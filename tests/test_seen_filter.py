@@ -0,0 +1,75 @@
+import time
+
+from seen_filter import SeenJobFilter
+
+
+def test_membership_survives_save_and_load(tmp_path):
+    path = str(tmp_path / 'state' / 'seen_jobs.bin')
+    seen_filter = SeenJobFilter(path, capacity=1000)
+    for job_id in range(4250000000, 4250000500):
+        seen_filter.add(job_id)
+    seen_filter.add(('data engineer', 'acme analytics', 'austin, tx'))
+    seen_filter.save()
+
+    loaded = SeenJobFilter(path, capacity=1000)
+    loaded.load()
+    assert all(job_id in loaded for job_id in range(4250000000, 4250000500))
+    assert ('data engineer', 'acme analytics', 'austin, tx') in loaded
+    assert loaded.count == seen_filter.count == 501
+
+    # 1000 unseen ids at a 0.1% false-positive rate should yield only a handful of hits
+    assert sum(job_id in loaded for job_id in range(4260000000, 4260001000)) < 10
+
+
+def test_add_reports_identities_already_present():
+    seen_filter = SeenJobFilter('unused.bin', capacity=100)
+    assert seen_filter.add(4250137687)
+    assert not seen_filter.add(4250137687)
+    assert seen_filter.count == 1
+
+
+def test_full_generation_rotates_and_is_still_remembered():
+    seen_filter = SeenJobFilter('unused.bin', capacity=10)
+    for job_id in range(10):
+        seen_filter.add(job_id)
+
+    assert seen_filter.count == 0
+    assert all(job_id in seen_filter for job_id in range(10))
+
+    # A second rotation drops the oldest generation
+    for job_id in range(100, 110):
+        seen_filter.add(job_id)
+    assert all(job_id in seen_filter for job_id in range(100, 110))
+    assert sum(job_id in seen_filter for job_id in range(10)) < 3
+
+
+def test_load_rotates_a_generation_older_than_the_rotation_period(tmp_path):
+    path = str(tmp_path / 'seen_jobs.bin')
+    seen_filter = SeenJobFilter(path, capacity=100, rotation_days=14)
+    seen_filter.add(4250137687)
+    seen_filter.rotated_at = int(time.time()) - 15 * 24 * 60 * 60
+    seen_filter.save()
+
+    loaded = SeenJobFilter(path, capacity=100, rotation_days=14)
+    loaded.load()
+    assert loaded.count == 0
+    assert 4250137687 in loaded
+    assert loaded.rotated_at > seen_filter.rotated_at
+
+
+def test_load_starts_empty_when_the_settings_changed(tmp_path):
+    path = str(tmp_path / 'seen_jobs.bin')
+    seen_filter = SeenJobFilter(path, capacity=100)
+    seen_filter.add(4250137687)
+    seen_filter.save()
+
+    resized = SeenJobFilter(path, capacity=200)
+    resized.load()
+    assert 4250137687 not in resized
+    assert resized.count == 0
+
+
+def test_load_starts_empty_without_a_file(tmp_path):
+    seen_filter = SeenJobFilter(str(tmp_path / 'missing.bin'))
+    seen_filter.load()
+    assert 4250137687 not in seen_filter
@@ -1,40 +1,391 @@
 import pandas as pd
 import json
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+from scipy import sparse
 import numpy as np
+import math
+import re
+import hashlib
 import os
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
+from collections import Counter, OrderedDict
+from job_store import open_job_store
 
-# Specify the path to your JSON file
-json_file_path = os.path.join(os.path.dirname(__file__), 'data', 'database.json') 
-
-# Read the JSON file
-try:
-    with open(json_file_path, 'r') as file:
-        json_data = json.load(file)
-except FileNotFoundError:
-    print(f"Error: File '{json_file_path}' not found.")
-    exit()
-except json.JSONDecodeError:
-    print(f"Error: File '{json_file_path}' contains invalid JSON.")
-    exit()
-
-# Check if the JSON data is a list or a single record
-if not isinstance(json_data, list):
-    json_data = [json_data]  # Convert single record to list for consistent processing
-
-# Load the Excel file
+# Specify the path to the job database, used when the crawler config does not set one
+database_file_path = os.path.join(os.path.dirname(__file__), 'data', 'database.jsonl')
+
+# Crawler configuration that selects the job storage backend
+config_file_path = os.path.join(os.path.dirname(__file__), 'data', 'carwler.json')
+
+# Path to the USCIS H-1B employer data workbook
 excel_file_path = os.path.join(os.path.dirname(__file__), 'data', 'uscis.xlsx')  # Replace with your actual path
-try:
-    excel_data = pd.read_excel(excel_file_path)
-except FileNotFoundError:
-    print(f"Error: Excel file '{excel_file_path}' not found.")
-    exit()
 
-excel_data.dropna(subset=['Employer (Petitioner) Name'], inplace=True)  # Drop rows with missing company names in Excel data
+# Directory holding the fitted employer index between runs
+index_cache_dir = os.path.join(os.path.dirname(__file__), 'data', 'cache')
+
+# Match memo, kept with the crawler state that is saved after every run rather
+# than in the index cache, which is only saved when the workbook changes
+memo_file_path = os.path.join(os.path.dirname(__file__), 'data', 'state', 'match_memo.json')
+
+# Set a threshold for considering a match
+MATCH_THRESHOLD = 0.6
+
+# Number of candidate employers kept per company (only the best one is reported)
+MATCH_TOP_K = 1
+
+EMPLOYER_COLUMN = 'Employer (Petitioner) Name'
+
+FISCAL_YEAR_COLUMN = 'Fiscal Year'
+
+# Per-filing metrics summed for each canonical employer
+METRIC_COLUMNS = ['Initial Approval', 'Initial Denial', 'Continuing Approval', 'Continuing Denial']
+
+# The only workbook columns the index needs, with compact dtypes for the columnar cache
+USCIS_DTYPES = {EMPLOYER_COLUMN: 'category', FISCAL_YEAR_COLUMN: 'int16', **{column: 'int32' for column in METRIC_COLUMNS}}
+
+# Columns of the per-employer side table kept next to the index
+STAT_COLUMNS = METRIC_COLUMNS + ['First Fiscal Year', 'Last Fiscal Year', 'Filings']
+
+# Bumped whenever the cached index layout or its contents change
+INDEX_FORMAT_VERSION = 2
+
+# Upper bound on memoized companies; the least recently used are evicted first
+MEMO_MAX_ENTRIES = 20000
+
+# Legal-entity suffixes dropped from the end of company names before exact matching
+LEGAL_SUFFIXES = {'inc', 'incorporated', 'llc', 'corp', 'corporation', 'co', 'company', 'ltd', 'limited',
+                  'llp', 'lp', 'plc', 'pllc', 'pc'}
+
+
+def file_hash(path):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def normalize_company_name(company_name):
+    """Case-fold a company name, strip punctuation and drop trailing legal suffixes."""
+    company_name = re.sub(r"[.,']", '', company_name.casefold())  # "L.L.C." -> "llc"
+    tokens = re.sub(r'[\W_]+', ' ', company_name).split()
+    while tokens and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return ' '.join(tokens)
+
+
+def canonicalize_employers(excel_data):
+    """Collapse USCIS filings into one row per normalized employer with aggregated metrics."""
+    excel_data = excel_data.rename(columns=str.strip)  # The export pads some headers, e.g. "Fiscal Year   "
+    excel_data = excel_data.dropna(subset=[EMPLOYER_COLUMN])  # Drop rows with missing company names in Excel data
+    names = excel_data[EMPLOYER_COLUMN].astype(str)
+    keys = names.map(normalize_company_name)
+    keys = keys.where(keys != '', names.str.casefold())  # Names made only of suffixes keep their own key
+
+    # The canonical name is the spelling used by the most filings of that employer
+    spellings = excel_data.groupby([keys, names], sort=False).size()
+    canonical_names = spellings.groupby(level=0, sort=False).idxmax().map(lambda pair: pair[1])
+
+    grouped = excel_data.groupby(keys, sort=False)
+    stats = grouped[METRIC_COLUMNS].sum()
+    stats['First Fiscal Year'] = grouped[FISCAL_YEAR_COLUMN].min()
+    stats['Last Fiscal Year'] = grouped[FISCAL_YEAR_COLUMN].max()
+    stats['Filings'] = grouped.size()
+
+    return canonical_names.tolist(), stats.loc[canonical_names.index, STAT_COLUMNS].to_numpy(dtype=np.int32)
+
+
+class MappedNames:
+    """Read-only sequence of strings decoded on demand from a memory-mapped UTF-8 file."""
+
+    def __init__(self, path, offsets):
+        self.blob = np.memmap(path, dtype=np.uint8, mode='r') if offsets[-1] else np.zeros(0, dtype=np.uint8)
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row):
+        return self.blob[self.offsets[row]:self.offsets[row + 1]].tobytes().decode('utf-8')
+
+
+class EmployerIndex:
+    """Character n-gram TF-IDF index over USCIS employer names, fitted once and cached between runs."""
+
+    def __init__(self, employer_names, stats, matrix, vocabulary, idf, exact_rows):
+        self.employer_names = employer_names
+        self.stats = stats  # one row of STAT_COLUMNS per employer
+        self.matrix = matrix
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.exact_rows = exact_rows  # normalized employer name -> row
+        self.source_hash = None  # hash of the workbook the index was built from
+
+        # N-grams missing from the employer vocabulary still count towards a query's
+        # norm, weighted with the smoothed IDF they had when each query was fitted
+        # together with the employers: in 1 of N + 1 documents, ln((N + 2) / 2) + 1
+        self.unseen_idf = math.log((len(self.employer_names) + 2) / 2) + 1
+        self.counter = CountVectorizer(analyzer='char_wb', ngram_range=(2, 3), vocabulary=self.vocabulary)
+        self.analyzer = self.counter.build_analyzer()
+
+    @classmethod
+    def fit(cls, employer_names, stats):
+        """Fit the vocabulary, IDF weights and normalized matrix over canonical employer names."""
+        employer_names = list(employer_names)
+        vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 3), norm=None)
+        matrix = normalize(vectorizer.fit_transform(employer_names)).tocsr()
+
+        exact_rows = {}
+        for row, employer_name in enumerate(employer_names):
+            key = normalize_company_name(employer_name)
+            if key:
+                exact_rows.setdefault(key, row)
+
+        return cls(employer_names, stats, matrix, vectorizer.vocabulary_, vectorizer.idf_, exact_rows)
+
+    def save(self, cache_dir, source_hash):
+        """Write the fitted index to cache_dir as raw arrays that can be memory-mapped."""
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # Each file is written under a temporary name and swapped in, so processes that
+        # have the previous index mapped keep reading the old files instead of truncated ones
+        def replace(name, write):
+            path = os.path.join(cache_dir, name)
+            temp_path = path + '.tmp'
+            with open(temp_path, 'wb') as file:
+                write(file)
+            os.replace(temp_path, path)
+
+        def save_array(name, array):
+            replace(name, lambda file: np.save(file, array))
+
+        save_array('matrix_data.npy', self.matrix.data)
+        save_array('matrix_indices.npy', self.matrix.indices)
+        save_array('matrix_indptr.npy', self.matrix.indptr)
+        save_array('idf.npy', self.idf)
+        save_array('employer_stats.npy', self.stats)
+
+        # Employer names are concatenated UTF-8 with an offsets array, so lookups
+        # decode a single name from the mapped file instead of loading them all
+        encoded = [name.encode('utf-8') for name in self.employer_names]
+        replace('employers.bin', lambda file: file.write(b''.join(encoded)))
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(name) for name in encoded], out=offsets[1:])
+        save_array('employer_offsets.npy', offsets)
+
+        # Terms are stored in column order so the vocabulary can be rebuilt from positions
+        terms = [None] * len(self.vocabulary)
+        for term, column in self.vocabulary.items():
+            terms[column] = term
+
+        # The metadata is written last, so an interrupted save never matches a source hash
+        metadata = {'format': INDEX_FORMAT_VERSION, 'source_hash': source_hash,
+                    'shape': list(self.matrix.shape), 'terms': terms, 'exact_rows': self.exact_rows}
+        replace('employer_index.json', lambda file: file.write(json.dumps(metadata).encode('utf-8')))
+
+    @classmethod
+    def load(cls, cache_dir, source_hash):
+        """Memory-map a cached index built from the same workbook, or return None."""
+        try:
+            with open(os.path.join(cache_dir, 'employer_index.json'), 'r') as file:
+                metadata = json.load(file)
+            if metadata.get('format') != INDEX_FORMAT_VERSION or metadata['source_hash'] != source_hash:
+                return None
+
+            # Read-only mappings let every matcher process share the page cache
+            def mapped(name):
+                return np.load(os.path.join(cache_dir, name), mmap_mode='r')
+
+            matrix = sparse.csr_matrix(
+                (mapped('matrix_data.npy'), mapped('matrix_indices.npy'), mapped('matrix_indptr.npy')),
+                shape=tuple(metadata['shape']), copy=False)
+            idf = mapped('idf.npy')
+            stats = mapped('employer_stats.npy')
+            employer_names = MappedNames(os.path.join(cache_dir, 'employers.bin'), mapped('employer_offsets.npy'))
+        except (OSError, KeyError, ValueError):
+            return None
+
+        # A rebuild running in another process can swap the arrays in between reading the
+        # metadata and mapping them, so arrays that do not fit the metadata mean a miss
+        rows = metadata['shape'][0]
+        if len(employer_names) != rows or len(stats) != rows or len(idf) != len(metadata['terms']) \
+                or len(matrix.indices) != matrix.indptr[-1] or len(employer_names.blob) != employer_names.offsets[-1]:
+            return None
+
+        vocabulary = {term: column for column, term in enumerate(metadata['terms'])}
+        employer_index = cls(employer_names, stats, matrix, vocabulary, idf, metadata['exact_rows'])
+        employer_index.source_hash = source_hash
+        return employer_index
+
+    def employer_stats(self, row):
+        """Return the aggregated USCIS metrics of one employer as a dict."""
+        return {column: int(value) for column, value in zip(STAT_COLUMNS, self.stats[row])}
+
+    def transform(self, company_names):
+        """Vectorize a batch of company names into L2-normalized TF-IDF rows."""
+        weighted = (self.counter.transform(company_names) @ sparse.diags(self.idf)).tocsr()
+        squared_norms = np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel()
+
+        for i, company_name in enumerate(company_names):
+            unseen = [count for ngram, count in Counter(self.analyzer(company_name)).items()
+                      if ngram not in self.vocabulary]
+            squared_norms[i] += sum(count * count for count in unseen) * self.unseen_idf ** 2
+
+        norms = np.sqrt(squared_norms)
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms) @ weighted
+
+    def search(self, company_names, k=1, threshold=0.0, chunk_size=64):
+        """Return the top-k (row, score) pairs scoring at least threshold for each company name."""
+        results = [None] * len(company_names)
+
+        # Exact normalized-name hits are resolved from the hash map with a score of 1.0
+        misses = []
+        for i, company_name in enumerate(company_names):
+            row = self.exact_rows.get(normalize_company_name(company_name))
+            if row is not None:
+                results[i] = [(row, 1.0)]
+            else:
+                misses.append(i)
+
+        # Score blocks of the remaining queries with one sparse product each, keeping peak memory bounded
+        for start in range(0, len(misses), chunk_size):
+            block = misses[start:start + chunk_size]
+            # Multiplying the employer matrix from the left keeps it in its memory-mapped CSR form
+            queries = self.transform([company_names[i] for i in block])
+            scores = (self.matrix @ queries.T).T.tocsr()
+
+            for position, i in enumerate(block):
+                values = scores.data[scores.indptr[position]:scores.indptr[position + 1]]
+                rows = scores.indices[scores.indptr[position]:scores.indptr[position + 1]]
+
+                above = values >= threshold
+                values, rows = values[above], rows[above]
+                if len(values) > k:
+                    top = np.argpartition(-values, k - 1)[:k]
+                    values, rows = values[top], rows[top]
+
+                order = np.argsort(-values, kind='stable')
+                results[i] = [(int(rows[j]), float(values[j])) for j in order]
+
+        return results
+
+
+def load_uscis_data(excel_file_path, cache_dir, source_hash):
+    """Load the needed USCIS columns, converting the workbook to Parquet the first time it is seen."""
+    parquet_path = os.path.join(cache_dir, f"uscis-{source_hash[:16]}.parquet")
+    try:
+        return pd.read_parquet(parquet_path)
+    except (OSError, ValueError, ImportError):
+        pass
+
+    print(f"Reading {excel_file_path}")
+    excel_data = pd.read_excel(excel_file_path, usecols=lambda column: column.strip() in USCIS_DTYPES)
+    excel_data = excel_data.rename(columns=str.strip)  # The export pads some headers, e.g. "Fiscal Year   "
+    excel_data = excel_data.dropna(subset=[EMPLOYER_COLUMN])  # Drop rows with missing company names in Excel data
+    excel_data[METRIC_COLUMNS] = excel_data[METRIC_COLUMNS].fillna(0)
+    excel_data = excel_data.astype(USCIS_DTYPES)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = parquet_path + '.tmp'
+        excel_data.to_parquet(temp_path, index=False)
+        os.replace(temp_path, parquet_path)
+
+        # Drop conversions of older workbooks
+        for name in os.listdir(cache_dir):
+            if name.startswith('uscis-') and name.endswith('.parquet') and name != os.path.basename(parquet_path):
+                os.remove(os.path.join(cache_dir, name))
+    except ImportError:
+        print("pyarrow is not installed, the workbook will be read again on the next rebuild")
+    except OSError as e:
+        print(f"Error saving columnar USCIS cache: {e}")
+
+    return excel_data
+
+
+def load_employer_index(excel_file_path, cache_dir):
+    """Load the employer index from cache, rebuilding it only when the workbook changes."""
+    source_hash = file_hash(excel_file_path)
+    employer_index = EmployerIndex.load(cache_dir, source_hash)
+    if employer_index is not None:
+        print(f"Loaded cached employer index ({len(employer_index.employer_names)} employers)")
+        return employer_index
+
+    print(f"Building employer index from {excel_file_path}")
+    excel_data = load_uscis_data(excel_file_path, cache_dir, source_hash)
+    employer_names, stats = canonicalize_employers(excel_data)
+    print(f"Collapsed {len(excel_data)} filings into {len(employer_names)} employers")
+    employer_index = EmployerIndex.fit(employer_names, stats)
+    employer_index.source_hash = source_hash
+    try:
+        employer_index.save(cache_dir, source_hash)
+    except OSError as e:
+        print(f"Error saving employer index cache: {e}")
+    return employer_index
+
+
+class MatchMemo:
+    """Persisted LRU memo of company name -> search results for one employer index version."""
+
+    def __init__(self, path, version, max_entries=MEMO_MAX_ENTRIES):
+        self.path = path
+        self.version = version
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+        # Entries recorded against a different index version are discarded
+        try:
+            with open(path, 'r') as file:
+                memo = json.load(file)
+            if memo.get('version') == version:
+                self.entries = OrderedDict(memo['entries'])
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def get(self, company_name):
+        """Return the memoized [(row, score), ...] for a company, or None if unseen."""
+        matches = self.entries.get(company_name)
+        if matches is None:
+            return None
+        self.entries.move_to_end(company_name)
+        return [(row, score) for row, score in matches]
+
+    def put(self, company_name, matches):
+        """Record the search results for a company, evicting the least recently used entries."""
+        self.entries[company_name] = matches
+        self.entries.move_to_end(company_name)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def save(self):
+        """Atomically write the memo back to disk."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump({'version': self.version, 'entries': self.entries}, file)
+        os.replace(temp_path, self.path)
+
+
+def match_companies(employer_index, company_names, memo, k, threshold):
+    """Search the employer index for each company, consulting and updating the memo first."""
+    results = [memo.get(company_name) for company_name in company_names]
+    hits = sum(matches is not None for matches in results)
+
+    # Only companies the memo has never seen reach the vectorizer
+    misses = list(dict.fromkeys(name for name, matches in zip(company_names, results) if matches is None))
+    if misses:
+        for company_name, matches in zip(misses, employer_index.search(misses, k=k, threshold=threshold)):
+            memo.put(company_name, matches)
+        results = [memo.get(company_name) for company_name in company_names]
+
+    print(f"Memoized matches reused for {hits} of {len(company_names)} companies")
+    return results
 
 
 def send_batch_email_notification(matching_jobs, recipient_email):
@@ -44,8 +395,6 @@ def send_batch_email_notification(matching_jobs, recipient_email):
         sender_email = os.environ.get("SENDER_EMAIL")  # Replace with your Gmail
         print(f"Sender email: {sender_email}")  # Debugging line to check sender email
         sender_password = os.environ.get("SENDER_PASSWORD") 
-        print(sender_password)
-        print(type(sender_password))
         print(f"Sender password: {'*' * len(sender_password) if sender_password else 'Not Set'}")  # Mask password for security
         smtp_server = "smtp.gmail.com"
         smtp_port = 587
@@ -69,6 +418,7 @@ def send_batch_email_notification(matching_jobs, recipient_email):
                 <th>Matched Company</th>
                 <th>Job Title</th>
                 <th>Match Score</th>
+                <th>H-1B Approvals</th>
                 <th>Link</th>
               </tr>
         """
@@ -81,6 +431,7 @@ def send_batch_email_notification(matching_jobs, recipient_email):
                 <td>{job['matched_company']}</td>
                 <td>{job['title']}</td>
                 <td>{job['match_score']:.2f}</td>
+                <td>{job['approvals']}</td>
                 <td><a href="{job['url']}">View Job</a></td>
               </tr>
             """
@@ -108,71 +459,110 @@ def send_batch_email_notification(matching_jobs, recipient_email):
         print(f"Error sending email notification: {e}")
         return False
 
-# Modified company matching code
-matching_jobs = []  # To store all matching jobs
+class JobMatcher:
+    """Matches batches of job records against an employer index kept warm between batches."""
 
-for record in json_data:
+    def __init__(self, excel_file_path=excel_file_path, cache_dir=index_cache_dir, memo_path=memo_file_path,
+                 k=MATCH_TOP_K, threshold=MATCH_THRESHOLD):
+        self.excel_file_path = excel_file_path
+        self.cache_dir = cache_dir
+        self.memo_path = memo_path
+        self.k = k
+        self.threshold = threshold
+        self.employer_index = None
+        self.memo = None
 
-    if record["email_sent"]:
-        print(f"Skipping {record['company']} - Email already sent")
-        continue
-        
-    print(record["email_sent"], record["company"])
-    company_name = record["company"]
-    job_url = record["url"]
-    print(f"\nProcessing company: {company_name}")
-    
-    # Create a list of all company names to compare
-    all_companies = [company_name] + excel_data['Employer (Petitioner) Name'].tolist()
-    
-    # Initialize TF-IDF Vectorizer
-    vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 3))
-    
-    # Compute TF-IDF matrix
-    tfidf_matrix = vectorizer.fit_transform(all_companies)
-    
-    # Calculate cosine similarity
-    cosine_similarities = np.dot(tfidf_matrix[0:1], tfidf_matrix[1:].T).toarray()[0]
-    
-    # Add similarity scores to a copy of the dataframe
-    result_df = excel_data.copy()
-    result_df['Similarity_Score'] = cosine_similarities
-
-    # Set a threshold for considering a match
-    threshold = 0.6
-    result_df['Is_Match'] = result_df['Similarity_Score'] >= threshold
-    
-    # Get matches above threshold
-    matches = result_df[result_df['Is_Match']]
-    
-    # If there's at least one match, add to our matching jobs list
-    if len(matches) > 0:
-        best_match = matches.sort_values(by='Similarity_Score', ascending=False).iloc[0]
-        print(f"Found match: {company_name} -> {best_match['Employer (Petitioner) Name']} (Score: {best_match['Similarity_Score']:.2f})")
-        
-        # Add to matching jobs list with all necessary info
-        matching_jobs.append({
-            'title': record.get('title', 'Unknown Title'),
-            'company': company_name,
-            'matched_company': best_match['Employer (Petitioner) Name'],
-            'match_score': best_match['Similarity_Score'],
-            'url': job_url,
-            'location': record.get('location', 'Unknown Location')
-        })
-
-        print(matching_jobs)
-
-        # Mark this record for email sent flag (will be updated later)
-        record["email_sent"] = True
+    def load_index(self):
+        """Load the employer index and match memo on first use."""
+        if self.employer_index is None:
+            self.employer_index = load_employer_index(self.excel_file_path, self.cache_dir)
+            # The memo is tied to the workbook, index layout and search parameters that produced it
+            memo_version = f"{self.employer_index.source_hash}:{INDEX_FORMAT_VERSION}:{self.k}:{self.threshold}"
+            self.memo = MatchMemo(self.memo_path, memo_version)
+        return self.employer_index
+
+    def match_batch(self, records):
+        """Match job records to sponsoring employers, returning (record, matching job) pairs."""
+        if not records:
+            return []
+
+        employer_index = self.load_index()
+        search_results = match_companies(employer_index, [record["company"] for record in records],
+                                         self.memo, self.k, self.threshold)
+        try:
+            self.memo.save()
+        except OSError as e:
+            print(f"Error saving match memo: {e}")
+
+        matches = []
+        for record, candidates in zip(records, search_results):
+            company_name = record["company"]
+            print(f"\nProcessing company: {company_name}")
+
+            # If there's at least one match above the threshold, add to our matching jobs list
+            if candidates:
+                best_row, best_score = candidates[0]
+                matched_company = employer_index.employer_names[best_row]
+                employer_stats = employer_index.employer_stats(best_row)
+                print(f"Found match: {company_name} -> {matched_company} (Score: {best_score:.2f})")
+
+                # Add to matching jobs list with all necessary info
+                matches.append((record, {
+                    'title': record.get('title', 'Unknown Title'),
+                    'company': company_name,
+                    'matched_company': matched_company,
+                    'match_score': best_score,
+                    'approvals': employer_stats['Initial Approval'] + employer_stats['Continuing Approval'],
+                    'url': record["url"],
+                    'location': record.get('location', 'Unknown Location')
+                }))
+        return matches
+
+
+def notify(matches):
+    """Email the matching jobs and flag their records as sent, returning True on success."""
+    if not matches:
+        print("No matching companies found, no email sent")
+        return False
 
-# After processing all jobs, send a single email if we have matches
-if matching_jobs:
     recipient_email = os.environ.get("RECIPIENT_EMAIL")  # Replace with recipient's email
-    if send_batch_email_notification(matching_jobs, recipient_email):
-        with open(json_file_path, 'w') as file:
-            json.dump(json_data, file, indent=4)
-            print(f"Updated job database with email sent flags")
-    else:
+    if not send_batch_email_notification([matching_job for _, matching_job in matches], recipient_email):
         print("Failed to send email, not updating email_sent flags")
-else:
-    print("No matching companies found, no email sent")
+        return False
+
+    for record, _ in matches:
+        record["email_sent"] = True
+    return True
+
+
+def open_configured_store():
+    """Open the job store selected in the crawler configuration."""
+    config = {}
+    if os.path.exists(config_file_path):
+        with open(config_file_path, 'r') as file:
+            config = json.load(file)
+    return open_job_store(config.get('database_file', database_file_path), config.get('storage_backend'))
+
+
+def main():
+    """Match unsent jobs in the job store and email the ones at H-1B sponsors."""
+    try:
+        store = open_configured_store()
+        records = store.load_unsent_jobs()
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not read job database: {e}")
+        return
+
+    try:
+        matches = JobMatcher().match_batch(records)
+        if notify(matches):
+            store.mark_notified([record for record, _ in matches])
+            print(f"Updated job database with email sent flags")
+    except FileNotFoundError:
+        print(f"Error: Excel file '{excel_file_path}' not found.")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()